@@ -8,9 +8,10 @@
 import gurobipy as gp
 from gurobipy import GRB
 import pandas as pd
-import random
-from datetime import datetime
-import math
+import numpy as np
+from scipy import sparse
+from numba import njit
+import itertools
 from typing import List, Dict, Set, Tuple, Any
 
 # TODO: Double check class duration constraint
@@ -21,6 +22,7 @@ from typing import List, Dict, Set, Tuple, Any
 LOCAL_SCHEDULE_FILEPATH = 'F24-Schedule-ECE.csv' 
 MAX_ROOMS_ALLOWED = 50
 TIME_SLOT_HOURS = range(8, 22) # Use 8 AM to 10 PM (22:00) for time slots
+PLACEHOLDER_SEED = 0 # Seeds the placeholder enrollment/capacity draws so runs are repeatable
 
 # --- 2. DATA LOADING AND FEATURE CONSTRUCTION ---
 
@@ -30,35 +32,33 @@ def build_time_slots(time_hours: range) -> List[str]:
     hours = [f"{h:02d}:00" for h in time_hours]
     return [f"{day}_{hour}" for day in days for hour in hours]
 
-def calculate_duration_slots(begin_str: str, end_str: str) -> int:
+def calculate_duration_slots(begin: pd.Series, end: pd.Series) -> pd.Series:
     """
     Calculates duration in hours, rounding up greedily.
     Example: 8:00AM to 9:20AM = 1h 20m -> Rounds up to 2 slots.
     """
-    if pd.isna(begin_str) or pd.isna(end_str) or begin_str == 'TBA':
-        return 1 # Default to 1 hour if unknown
-    
     fmt = "%I:%M%p" # Format: 08:00AM
-    try:
-        t_start = datetime.strptime(begin_str, fmt)
-        t_end = datetime.strptime(end_str, fmt)
-        
-        # Calculate difference in minutes
-        diff_minutes = (t_end - t_start).total_seconds() / 60
-        
-        # Greedily round up to nearest 60 minutes
-        # 1 min to 60 min = 1 slot; 61 min = 2 slots
-        slots = math.ceil(diff_minutes / 60)
-        return max(1, slots) # Ensure at least 1 slot
-    except Exception:
-        return 1
+    # 'TBA', NaN and malformed times all parse to NaT
+    t_start = pd.to_datetime(begin, format=fmt, errors='coerce')
+    t_end = pd.to_datetime(end, format=fmt, errors='coerce')
+
+    # Calculate difference in minutes
+    diff_minutes = (t_end - t_start).dt.total_seconds() / 60
+
+    # Greedily round up to nearest 60 minutes
+    # 1 min to 60 min = 1 slot; 61 min = 2 slots
+    slots = np.ceil(diff_minutes / 60)
+    # Default to 1 hour if unknown; ensure at least 1 slot
+    return slots.fillna(1).clip(lower=1).astype(int)
 
 def load_and_map_features(filepath: str) -> Tuple[List[str], List[str], List[str], Dict[str, List[str]], List[str], Dict[str, int], Dict[str, int]]:
     """Loads CSV, cleans data, and generates feature sets for the optimization model."""
     print(f"[Data] Loading and mapping data from {filepath}...")
     
-    # Use Pandas to load the CSV file
-    df = pd.read_csv(filepath)
+    # Use Pandas to load the CSV file: Arrow's multithreaded reader into
+    # Arrow-backed columns; COURSE is only an ID
+    df = pd.read_csv(filepath, engine='pyarrow', dtype_backend='pyarrow',
+                     dtype={'COURSE': 'string[pyarrow]'})
     df.columns = [col.strip() for col in df.columns]
 
     # Drop rows that are TBA or Cancelled
@@ -70,15 +70,14 @@ def load_and_map_features(filepath: str) -> Tuple[List[str], List[str], List[str
     df['MeetingID'] = df['COURSE'].astype(str) + '-' + df['SEC']
 
     # Handle multiple instructors in the 'INSTRUCTOR' column (e.g., "Last, First; Other, Name")
-    df['INSTRUCTORS'] = df['INSTRUCTOR'].str.split(';').apply(lambda x: [i.strip() for i in x])
+    # One regex split drops the whitespace around each ';' (no per-row lambda)
+    df['INSTRUCTORS'] = df['INSTRUCTOR'].str.strip().str.split(r'\s*;\s*', regex=True)
     
     # 1. Calculate Duration (The Greedy Rounding)
     # Instead of mapping to specific times (e.g. "Mon_09:00"), we calculate 
     # how many integer slots are needed (e.g. 80mins -> 2 slots).
     # Uses helper function 'calculate_duration_slots' above
-    df['DurationSlots'] = df.apply(
-        lambda row: calculate_duration_slots(row['BEGIN'], row['END']), axis=1
-    )
+    df['DurationSlots'] = calculate_duration_slots(df['BEGIN'], df['END'])
 
     # 2. Create a clean "Meetings" dataframe
     # We drop duplicates so each Section (MeetingID) appears exactly once.
@@ -98,7 +97,9 @@ def load_and_map_features(filepath: str) -> Tuple[List[str], List[str], List[str
 
     # 4. Create the Duration Map
     # This is the key new dictionary the Gurobi solver needs to check conflicts.
-    meeting_duration_map = meeting_df.set_index('MeetingID')['DurationSlots'].to_dict()
+    # Index the meeting rows once; the instructor map below reads the same index
+    meeting_index = meeting_df.set_index('MeetingID')
+    meeting_duration_map = meeting_index['DurationSlots'].to_dict()
     
     # TODO: REMOVE / ADJUST --- Enforce License Limit ---
     limited_room_list = all_rooms_raw[:MAX_ROOMS_ALLOWED]
@@ -108,17 +109,18 @@ def load_and_map_features(filepath: str) -> Tuple[List[str], List[str], List[str
     timeslots_list = build_time_slots(TIME_SLOT_HOURS)
 
     # Create mapping of meeting ID to list of instructors
-    meeting_instructors_map = df.set_index('MeetingID')['INSTRUCTORS'].to_dict()
+    meeting_instructors_map = meeting_index['INSTRUCTORS'].to_dict()
 
     # Create map of MeetingID to required size (placeholder for now)
-    meeting_enrollment_map = {
-        meeting: random.randint(15, 80) for meeting in all_meetings
-    }
+    rng = np.random.default_rng(PLACEHOLDER_SEED)
+    meeting_enrollment_map = dict(zip(
+        all_meetings, rng.integers(15, 81, size=len(all_meetings)).tolist()
+    ))
     
     # Create map of Room to capacity (placeholder for now)
-    room_capacity_map = {
-        room: random.randint(30, 150) for room in limited_room_list
-    }
+    room_capacity_map = dict(zip(
+        limited_room_list, rng.integers(30, 151, size=len(limited_room_list)).tolist()
+    ))
     
     print(f"[Map] Total discrete time slots: {len(timeslots_list)}")
     print(f"[Map] Total unique meetings (sections/lectures) to schedule: {len(all_meetings)}")
@@ -128,6 +130,54 @@ def load_and_map_features(filepath: str) -> Tuple[List[str], List[str], List[str
 
 # --- 3. GUROBI MODEL (Classical Baseline Solver) ---
 
+@njit(cache=True)
+def _greedy_place(room_indptr, room_indices, inst_indptr, inst_indices,
+                  cand_indptr, cand_indices, room_used, inst_used, start):
+    # Compiled inner loop of greedy_start over the raw CSR arrays
+    for c in range(len(cand_indptr) - 1):
+        for p in range(cand_indptr[c], cand_indptr[c + 1]):
+            k = cand_indices[p]
+            free = True
+            for q in range(room_indptr[k], room_indptr[k + 1]):
+                if room_used[room_indices[q]]:
+                    free = False
+                    break
+            if free:
+                for q in range(inst_indptr[k], inst_indptr[k + 1]):
+                    if inst_used[inst_indices[q]]:
+                        free = False
+                        break
+            if not free:
+                continue
+
+            for q in range(room_indptr[k], room_indptr[k + 1]):
+                room_used[room_indices[q]] = True
+            for q in range(inst_indptr[k], inst_indptr[k + 1]):
+                inst_used[inst_indices[q]] = True
+            for q in range(cand_indptr[c], cand_indptr[c + 1]):
+                start[cand_indices[q]] = 0.0
+            start[k] = 1.0
+            break
+
+def greedy_start(room_rows: sparse.csr_matrix, inst_rows: sparse.csr_matrix, candidates: List[List[int]]) -> np.ndarray:
+    """
+    Builds a MIP start greedily: each meeting, in the given order, takes its first
+    candidate placement whose C2 (room, slot) and C4 (instructor, slot) rows are still free.
+    room_rows / inst_rows: one row per placement listing the constraint rows it occupies.
+    Meetings left without a free placement stay GRB.UNDEFINED for Gurobi to complete.
+    """
+    start = np.full(room_rows.shape[0], GRB.UNDEFINED)
+    room_used = np.zeros(room_rows.shape[1], dtype=np.bool_)
+    inst_used = np.zeros(inst_rows.shape[1], dtype=np.bool_)
+
+    cand_indptr = np.cumsum([0] + [len(placements) for placements in candidates])
+    cand_indices = np.fromiter(itertools.chain.from_iterable(candidates), dtype=np.int64, count=cand_indptr[-1])
+    _greedy_place(
+        room_rows.indptr, room_rows.indices, inst_rows.indptr, inst_rows.indices,
+        cand_indptr, cand_indices, room_used, inst_used, start
+    )
+    return start
+
 def build_and_run_model(
     meetings: List[str],
     rooms: List[str],
@@ -144,6 +194,15 @@ def build_and_run_model(
     try:
         m = gp.Model("course_scheduling_classical_baseline")
 
+        # --- Solver Parameters ---
+        # Pure feasibility model (zero objective): steer the search toward
+        # finding any feasible schedule fast
+        m.Params.MIPFocus = 1   # feasibility first
+        m.Params.SolutionLimit = 1  # any schedule will do: stop at the first feasible one
+        m.Params.Heuristics = 0.5   # spend more of the search in primal heuristics
+        m.Params.Presolve = 2   # aggressive presolve on the set-packing rows
+        m.Params.Seed = 0       # reproducible runs
+
         # --- Variables Calculation (DEBUGGING) ---
         num_meetings = len(meetings)
         num_rooms = len(rooms)
@@ -154,91 +213,97 @@ def build_and_run_model(
 
         days = ["Mon", "Tue", "Wed", "Thu", "Fri"]
         slots_per_day = {day: [t for t in timeslots if t.startswith(day)] for day in days}
+
+        # A meeting with duration D can only start in the first (N - D + 1) slots of a day;
+        # only a few distinct durations exist, so build each day's start range once per duration
+        valid_starts = {
+            (day, dur): range(len(slots_per_day[day]) - dur + 1)
+            for day in days for dur in set(meeting_duration.values())
+        }
+
+        # Key x by integer ids rather than name strings so x.sum hashes int tuples
+        meeting_id = {meeting: i for i, meeting in enumerate(meetings)}
+        slot_id = {t: i for i, t in enumerate(timeslots)}
+
+        # Capacity Check Pre-filter as one broadcast comparison:
+        # fits[rid, mid] is True when room rid seats meeting mid's enrollment
+        enrollment_arr = np.array([meeting_enrollment[meeting] for meeting in meetings])
+        capacity_arr = np.array([room_capacity[room] for room in rooms])
+        fits = capacity_arr[:, None] >= enrollment_arr[None, :]
         
         # A typical Gurobi commercial license limit for unrestricted academic use is 2000 variables.
         # However, restricted (trial/limited academic) licenses may be much lower (e.g., 500-1000).
         # We must ensure this number is acceptable to Gurobi's license.
 
-        x = {}
-        count_vars = 0
+        triples = [] # (meeting id, start slot id, room id) of every feasible placement
+        covers_meeting = {} # meeting id -> positions in triples of its placements
+        covers_inst = {} # (instructor, slot) -> positions in triples of every placement occupying that slot
         
         for meeting in meetings:
+            mid = meeting_id[meeting]
             duration = meeting_duration[meeting]
-            for room in rooms:
-                # Capacity Check Pre-filter
-                if room_capacity[room] < meeting_enrollment[meeting]:
-                    continue # optimization: don't create var if room too small
-                
+            instructors = set(meeting_instructors.get(meeting, []))
+            # optimization: don't create vars for rooms too small for the meeting
+            for rid in np.flatnonzero(fits[:, mid]).tolist():
                 for day in days:
                     day_slots = slots_per_day[day]
-                    # A meeting with duration D can only start in the first (N - D + 1) slots of the day
-                    valid_start_indices = len(day_slots) - duration + 1
                     
-                    for i in range(valid_start_indices):
+                    for i in valid_starts[day, duration]:
                         t_start = day_slots[i]
-                        x[meeting, t_start, room] = m.addVar(vtype=GRB.BINARY, name=f"x_{meeting}_{t_start}_{room}")
-                        count_vars += 1
+                        # Record the placement; its variable is created in bulk below
+                        k = len(triples)
+                        triples.append((mid, slot_id[t_start], rid))
+                        covers_meeting.setdefault(mid, []).append(k)
+
+                        # The placement occupies `duration` consecutive slots from t_start
+                        for slot in day_slots[i:i + duration]:
+                            for instructor in instructors:
+                                covers_inst.setdefault((instructor, slot), []).append(k)
                         
+        # One addMVar call for every placement instead of an addVar (and a name string) each
+        xv = m.addMVar(len(triples), vtype=GRB.BINARY)
+        count_vars = len(triples)
         print(f"[DEBUG] Total Binary Variables Created: {count_vars:,}")
 
+        def coverage_matrix(covers, keys):
+            """Sparse 0/1 matrix with a row per key present in covers, over its placements."""
+            rows = [covers[key] for key in keys if key in covers]
+            indptr = np.cumsum([0] + [len(row) for row in rows])
+            indices = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.int64, count=indptr[-1])
+            return sparse.csr_matrix(
+                (np.ones(len(indices)), indices, indptr), shape=(len(rows), len(triples))
+            )
+
         # --- Define Variables ---
         # x[m, t, r] = 1 if meeting m is at time t in room r
         # x = m.addVars(meetings, timeslots, rooms, vtype=GRB.BINARY, name="x")
 
         # --- C1: Schedule Each Meeting Exactly Once ---
         print("[Gurobi] Adding C1: Schedule each meeting (section/lecture) exactly once.")
-        # m.addConstrs(
-        #     (x.sum(m, '*', '*') == 1 for m in meetings), 
-        #     name="C1_ScheduleOnce"
-        # )
         for meeting in meetings:
-            # Sum over all valid t, r created for this meeting
-            relevant_vars = [x[meeting, t, r] for t in timeslots for r in rooms if (meeting, t, r) in x]
-            if not relevant_vars:
+            if meeting_id[meeting] not in covers_meeting:
                 print(f"Warning: Meeting {meeting} (Dur: {meeting_duration[meeting]}) has no valid placement options!")
-                continue
-            m.addConstr(gp.quicksum(relevant_vars) == 1, name=f"C1_{meeting}")
 
-        def get_active_vars_at_time(target_t, target_r, meeting_subset=None):
-            active_vars = []
-            target_day = target_t.split('_')[0]
-            day_slots = slots_per_day[target_day]
-            
-            try:
-                t_index = day_slots.index(target_t)
-            except ValueError:
-                return [] # Should not happen
-
-            candidate_meetings = meeting_subset if meeting_subset else meetings
-
-            for meet in candidate_meetings:
-                dur = meeting_duration[meet]
-                # A meeting covers 'target_t' if it started at 'start_t'
-                # such that: start_index <= t_index < start_index + dur
-                # Rewritten: t_index - dur < start_index <= t_index
-                
-                min_start_index = t_index - dur + 1
-                max_start_index = t_index
-                
-                for idx in range(max(0, min_start_index), max_start_index + 1):
-                    start_t = day_slots[idx]
-                    if (meet, start_t, target_r) in x:
-                        active_vars.append(x[meet, start_t, target_r])
-            return active_vars
-        
+        # One matrix constraint; row i sums every valid t, r created for the i-th placed meeting
+        A_c1 = coverage_matrix(covers_meeting, range(len(meetings)))
+        m.addMConstr(A_c1, xv, GRB.EQUAL, np.ones(A_c1.shape[0]), name="C1")
+
         # --- C2: No Two Meetings in the Same Room at the Same Time ---
         print("[Gurobi] Adding C2: Max one meeting per room per time slot.")
-        # m.addConstrs(
-        #     (x.sum('*', t, r) <= 1 for t in timeslots for r in rooms), 
-        #     name="C2_RoomConflict"
-        # )
-        for r in rooms:
-            for t in timeslots:
-                # Sum of all meetings that occupy room r at time t must be <= 1
-                # This includes meetings that started at t, t-1, t-2 etc. depending on their duration
-                active_vars = get_active_vars_at_time(t, r, meetings)
-                if active_vars:
-                    m.addConstr(gp.quicksum(active_vars) <= 1, name=f"C2_Room_{r}_{t}")
+        # Sum of all meetings that occupy room r at time t must be <= 1
+        # This includes meetings that started at t, t-1, t-2 etc. depending on their duration
+        # Built straight from the triples in numpy: placement k in room rid starting at
+        # slot tid covers slots tid .. tid + dur - 1 (a start never runs past its day)
+        trip = np.array(triples, dtype=np.int64).reshape(-1, 3)
+        durs = np.array([meeting_duration[meeting] for meeting in meetings], dtype=np.int64)[trip[:, 0]]
+        cols = np.repeat(np.arange(len(triples)), durs)
+        offsets = np.arange(len(cols)) - np.repeat(np.cumsum(durs) - durs, durs)
+        rows = trip[cols, 2] * len(timeslots) + trip[cols, 1] + offsets
+        A_c2 = sparse.csr_matrix(
+            (np.ones(len(cols)), (rows, cols)), shape=(len(rooms) * len(timeslots), len(triples))
+        )
+        A_c2 = A_c2[A_c2.getnnz(axis=1) > 0] # keep (room, slot) rows some placement occupies
+        m.addMConstr(A_c2, xv, GRB.LESS_EQUAL, np.ones(A_c2.shape[0]), name="C2_Room")
 
         
 
@@ -255,33 +320,38 @@ def build_and_run_model(
         
         # --- C4: No Instructor Conflict ---
         print("[Gurobi] Adding C4: No instructor conflicts.")
+        # Invert meeting -> instructors once instead of scanning every meeting per instructor
+        instructor_meetings = {}
+        for meeting in meetings:
+            for instructor in meeting_instructors.get(meeting, []):
+                instructor_meetings.setdefault(instructor, []).append(meeting)
+
         for instructor in all_instructors:
             # Find all meetings taught by this instructor
-            meetings_by_instructor = [
-                m for m in meetings if instructor in meeting_instructors.get(m, [])
-            ]
+            meetings_by_instructor = instructor_meetings.get(instructor, [])
             if not meetings_by_instructor:
                 print("error line 309 - instructors")
-                continue
-            
-            for t in timeslots:
-                # Sum of assignments for this instructor at time t must be <= 1
-                # m.addConstr(
-                #     gp.quicksum(x[m, t, r] 
-                #                 for m in meetings_by_instructor 
-                #                 for r in rooms) <= 1,
-                #     name=f"C4_InstConflict_{instructor.split(',')[0].replace(' ', '')}_{t}"
-                # )
-                # Instructor cannot be in ANY room at time t
-                # We need to sum over all rooms for the instructor's meetings active at t
-                expr = gp.LinExpr()
-                for r in rooms:
-                    active_vars = get_active_vars_at_time(t, r, meetings_by_instructor)
-                    for v in active_vars:
-                        expr.add(v)
-                
-                m.addConstr(expr <= 1, name=f"C4_Inst_{instructor}_{t}")
+
+        # Instructor cannot be in ANY room at time t: one row per (instructor, t) summing
+        # every placement of their meetings that occupies t, collected during variable creation
+        A_c4 = coverage_matrix(
+            covers_inst,
+            ((instructor, t) for instructor in all_instructors if instructor in instructor_meetings
+             for t in timeslots)
+        )
+        m.addMConstr(A_c4, xv, GRB.LESS_EQUAL, np.ones(A_c4.shape[0]), name="C4_Inst")
         
+        # --- Warm Start: Greedy Feasible Placement ---
+        # Longest meetings first (hardest to fit), each at its first free placement
+        print("[Gurobi] Building greedy MIP start.")
+        order = sorted(covers_meeting, key=lambda mid: -meeting_duration[meetings[mid]])
+        start = greedy_start(
+            A_c2.T.tocsr(), A_c4.T.tocsr(), [covers_meeting[mid] for mid in order]
+        )
+        placed = int((start == 1).sum())
+        print(f"[Gurobi] Greedy start placed {placed} of {len(order)} meetings.")
+        xv.Start = start
+
         # --- Objective: Feasibility (Find any valid schedule) ---
         m.setObjective(0, GRB.MINIMIZE)
 
@@ -289,7 +359,7 @@ def build_and_run_model(
         m.Params.OutputFlag = 1
         m.optimize()
 
-        print_schedule(m, x, meeting_duration, meeting_instructors)
+        print_schedule(m, xv, triples, (meetings, timeslots, rooms), meeting_duration, meeting_instructors)
 
     except gp.GurobiError as e:
         print(f"\n--- ❌ Gurobi Error ---")
@@ -332,29 +402,32 @@ def build_and_run_model(
 #     else:
 #         print(f"\n--- ⚠️ Optimization finished with status: {model.Status} ---")
 
-def print_schedule(model, x_vars, duration_map, meeting_instructors):
-    if model.Status == GRB.OPTIMAL:
+def print_schedule(model, x_vars, triples, labels, duration_map, meeting_instructors):
+    # SolutionLimit stops the feasibility solve at its first schedule
+    if model.Status in (GRB.OPTIMAL, GRB.SOLUTION_LIMIT) and model.SolCount > 0:
         print("\n--- ✅ Schedule Generated ---")
         schedule = {}
         
-        # Iterate through vars to find assignments
-        for (m, t, r), v in x_vars.items():
-            if v.X > 0.5:
-                # Calculate all slots this meeting covers
-                dur = duration_map[m]
-                day, hour_str = t.split('_')
-                hour = int(hour_str.split(':')[0])
+        # Read the whole solution vector in one call; positions index into triples
+        meetings, timeslots, rooms = labels
+        for k in np.flatnonzero(x_vars.X > 0.5):
+            mid, tid, rid = triples[k]
+            m, t, r = meetings[mid], timeslots[tid], rooms[rid]
+            # Calculate all slots this meeting covers
+            dur = duration_map[m]
+            day, hour_str = t.split('_')
+            hour = int(hour_str.split(':')[0])
+            
+            # Mark every covered slot in the schedule
+            for i in range(dur):
+                current_hour = hour + i
+                slot_key = f"{day}_{current_hour:02d}:00"
                 
-                # Mark every covered slot in the schedule
-                for i in range(dur):
-                    current_hour = hour + i
-                    slot_key = f"{day}_{current_hour:02d}:00"
-                    
-                    if slot_key not in schedule: schedule[slot_key] = []
-                    
-                    note = "(Cont.)" if i > 0 else "(Start)"
-                    instr = meeting_instructors[m][0] if meeting_instructors[m] else "Staff"
-                    schedule[slot_key].append(f"{note} {m} [{dur}hr] | {instr} | {r}")
+                if slot_key not in schedule: schedule[slot_key] = []
+                
+                note = "(Cont.)" if i > 0 else "(Start)"
+                instr = meeting_instructors[m][0] if meeting_instructors[m] else "Staff"
+                schedule[slot_key].append(f"{note} {m} [{dur}hr] | {instr} | {r}")
 
         # Sort and Print
         day_order = {"Mon": 0, "Tue": 1, "Wed": 2, "Thu": 3, "Fri": 4}
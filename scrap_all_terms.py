@@ -5,15 +5,20 @@ Pipeline:
 1. Download PDF for each term
 2. Parse PDF into raw structured objects
 3. Post-process into clean, QUBO-ready JSON
-4. Save to CSV + JSON
+4. Save to CSV + Parquet + JSON
 
 Folders produced:
   data/{term}/{term}_raw.json
   data/{term}/{term}_clean.json
   data/{term}/{term}_clean.csv
+  data/{term}/{term}_clean.parquet
+  data/.cache/{term}/{sha}.v{N}.raw.json, .clean.json   (parse cache, keyed by PDF hash)
 """
 
+import sys
 import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import pandas as pd
 import json
@@ -32,15 +37,30 @@ PDF_LINKS = {
 }
 
 
+# Bump whenever parse_pdf_schedule or enrich output changes so stale
+# parse-cache entries are ignored
+PARSE_CACHE_VERSION = 2
+
+
 # UTIL
+_BAR = "=" * 30
+
+
 def banner(term):
-    print("\n" + "=" * 30)
-    print(f"  SCRAPING TERM: {term}")
-    print("=" * 30)
+    # One write of the whole banner instead of three print calls
+    sys.stdout.write(f"\n{_BAR}\n  SCRAPING TERM: {term}\n{_BAR}\n")
+
+
+# Directories already created by this process; repeat calls skip the syscalls
+_created = set()
 
 
 def mkdir(path):
-    Path(path).mkdir(parents=True, exist_ok=True)
+    p = str(path)
+    if p in _created:
+        return
+    Path(p).mkdir(parents=True, exist_ok=True)
+    _created.add(p)
 
 
 # MAIN SCRAPE PIPELINE
@@ -62,9 +82,24 @@ def scrape_term(term):
     download_pdf(pdf_url, pdf_path)
     print(f"[OK] Saved PDF → {pdf_path}")
 
+    # Parse results are cached under the PDF's content hash, so an unchanged
+    # download skips both the PDF parse and the enrich pass
+    cache_dir = Path(f"data/.cache/{term}")
+    mkdir(cache_dir)
+    sha = hashlib.sha256(pdf_path.read_bytes()).hexdigest()
+    raw_cache_path = cache_dir / f"{sha}.v{PARSE_CACHE_VERSION}.raw.json"
+    clean_cache_path = cache_dir / f"{sha}.v{PARSE_CACHE_VERSION}.clean.json"
+
     # STEP 2 — Parse PDF → raw structured list
-    print(f"[PARSE] Parsing PDF for term: {term}")
-    raw = parse_pdf_schedule(pdf_path)
+    if raw_cache_path.exists():
+        print(f"[CACHE] PDF unchanged, reusing {raw_cache_path}")
+        with open(raw_cache_path) as f:
+            raw = json.load(f)
+    else:
+        print(f"[PARSE] Parsing PDF for term: {term}")
+        raw = parse_pdf_schedule(pdf_path)
+        with open(raw_cache_path, "w") as f:
+            json.dump(raw, f)
 
     raw_json_path = out_dir / f"{term}_raw.json"
     with open(raw_json_path, "w") as f:
@@ -73,8 +108,15 @@ def scrape_term(term):
     print(f"[OK] Saved raw JSON → {raw_json_path}")
 
     # STEP 3 — Post-process → normalized, QUBO-ready
-    print(f"[CLEAN] Normalizing and enhancing data...")
-    clean = enrich(raw)
+    if clean_cache_path.exists():
+        print(f"[CACHE] Reusing {clean_cache_path}")
+        with open(clean_cache_path) as f:
+            clean = json.load(f)
+    else:
+        print(f"[CLEAN] Normalizing and enhancing data...")
+        clean = enrich(raw)
+        with open(clean_cache_path, "w") as f:
+            json.dump(clean, f)
 
     clean_json_path = out_dir / f"{term}_clean.json"
     with open(clean_json_path, "w") as f:
@@ -127,6 +169,13 @@ def scrape_term(term):
 
     print(f"[OK] Saved CSV → {csv_path}")
 
+    # Columnar copy of the clean schema for repeat loads: typed columns, no
+    # re-parsing of the text (the solvers still read their own CSV schema)
+    parquet_path = out_dir / f"{term}_clean.parquet"
+    df.to_parquet(parquet_path, index=False, compression="zstd")
+
+    print(f"[OK] Saved Parquet → {parquet_path}")
+
     print(f"[DONE] Completed term: {term}")
 
 
@@ -137,8 +186,10 @@ if __name__ == "__main__":
     start = time.time()
     print("=== CMU PDF COURSE SCRAPER ===\n")
 
-    for t in terms:
-        scrape_term(t)
+    # Terms are independent (own PDF, own output folder): scrape them side by side.
+    # list() drains the map so a failure in any term is raised here
+    with ProcessPoolExecutor(max_workers=len(terms)) as ex:
+        list(ex.map(scrape_term, terms))
 
     print("\n==============================")
     print("  ALL TERMS COMPLETE")
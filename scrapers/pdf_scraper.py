@@ -1,12 +1,14 @@
 # scrapers/pdf_scraper.py
 
-import pdfplumber
+from pdfminer.high_level import extract_text
 import re
 
-COURSE_HEADER_RE = re.compile(r"^(\d{5})\s+(.+)\s+(\d+\.\d+|VAR|TBA)$")
-SECTION_RE = re.compile(
-    r"^(Lec|A\d*|B\d*|C\d*|D\d*|E\d*|F\d*|G\d*|H\d*|I\d*|J\d*|K\d*|L\d*)\s+([MTWRF]+)\s+(\d{1,2}:\d{2}[AP]M)\s+(\d{1,2}:\d{2}[AP]M)"
+COURSE_HEADER = r"(?P<course>\d{5})\s+(?P<title>.+)\s+(?P<units>\d+\.\d+|VAR|TBA)$"
+SECTION = (
+    r"(?P<sec>Lec|A\d*|B\d*|C\d*|D\d*|E\d*|F\d*|G\d*|H\d*|I\d*|J\d*|K\d*|L\d*)\s+(?P<days>[MTWRF]+)\s+(?P<begin>\d{1,2}:\d{2}[AP]M)\s+(?P<end>\d{1,2}:\d{2}[AP]M)"
 )
+# Both line kinds in one pattern, so each line is matched once and dispatched on the branch
+LINE_RE = re.compile(rf"(?P<header>{COURSE_HEADER})|(?P<section>{SECTION})")
 
 def parse_pdf_schedule(pdf_path):
     """
@@ -16,57 +18,56 @@ def parse_pdf_schedule(pdf_path):
     results = []
     current_course = None
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if not text: 
-                continue
+    # pdfminer's plain text pass, without pdfplumber's per-page layout objects.
+    # It pads columns with runs of spaces and blank lines; collapse both so each
+    # line reads exactly like pdfplumber's extract_text output
+    text = extract_text(pdf_path)
 
-            lines = text.split("\n")
+    for line in text.split("\n"):
+        line = " ".join(line.split())
+        if not line:
+            continue
 
-            for line in lines:
-                line = line.strip()
+        match = LINE_RE.match(line)
 
-                # Detect Course Header
-                header_match = COURSE_HEADER_RE.match(line)
-                if header_match:
-                    if current_course:
-                        results.append(current_course)
+        # Detect Course Header
+        if match and match.group("header"):
+            if current_course:
+                results.append(current_course)
 
-                    course, title, units = header_match.groups()
-                    current_course = {
-                        "course": course,
-                        "title": title.strip(),
-                        "units": units if units != "VAR" else None,
-                        "primary": None,
-                        "sections": []
-                    }
-                    continue
+            course, title, units = match.group("course", "title", "units")
+            current_course = {
+                "course": course,
+                "title": title.strip(),
+                "units": units if units != "VAR" else None,
+                "primary": None,
+                "sections": []
+            }
+            continue
 
-                # Detect Section (Lec, A, B, etc.)
-                sec_match = SECTION_RE.match(line)
-                if sec_match and current_course:
-                    sec, days, begin, end = sec_match.groups()
+        # Detect Section (Lec, A, B, etc.)
+        if match:
+            if current_course:
+                sec, days, begin, end = match.group("sec", "days", "begin", "end")
 
-                    entry = {
-                        "section": sec,
-                        "days": days,
-                        "begin": begin,
-                        "end": end
-                    }
+                entry = {
+                    "section": sec,
+                    "days": days,
+                    "begin": begin,
+                    "end": end
+                }
 
-                    if sec == "Lec":
-                        current_course["primary"] = entry
-                    else:
-                        current_course["sections"].append(entry)
+                if sec == "Lec":
+                    current_course["primary"] = entry
+                else:
+                    current_course["sections"].append(entry)
 
-                    continue
+            continue
 
-                # Append multiline title
-                if current_course and not COURSE_HEADER_RE.match(line):
-                    # If no section match and after header, likely a line of title
-                    if not SECTION_RE.match(line) and not line.startswith("Units"):
-                        current_course["title"] += " " + line.strip()
+        # Append multiline title
+        # If no header or section match and after header, likely a line of title
+        if current_course and not line.startswith("Units"):
+            current_course["title"] += " " + line
 
     # Add last course
     if current_course:
@@ -1,20 +1,31 @@
 # scrapers/postprocess.py
 
 import json
-from datetime import datetime
 import re
-
-def to_24h(t):
-    if t is None:
-        return None
-    return datetime.strptime(t, "%I:%M%p").strftime("%H:%M")
+import pandas as pd
+
+def parse_times(raw_courses):
+    """
+    Parses every distinct 12h time ("01:30PM") in raw_courses in one
+    vectorized pass; returns { raw: ("HH:MM", minutes since midnight) },
+    with None (no meeting time) mapped to (None, None)
+    """
+    raw = sorted({
+        t
+        for course in raw_courses
+        for s in [course["primary"], *course["sections"]] if s
+        for t in (s["begin"], s["end"]) if t is not None
+    })
+    parsed = pd.to_datetime(pd.Series(raw, dtype=object), format="%I:%M%p")
+    minutes = (parsed.dt.hour * 60 + parsed.dt.minute).tolist()
+    times = dict(zip(raw, zip(parsed.dt.strftime("%H:%M").tolist(), minutes)))
+    times[None] = (None, None)
+    return times
 
 def duration_minutes(begin, end):
     if begin is None or end is None:
         return None
-    b = datetime.strptime(begin, "%H:%M")
-    e = datetime.strptime(end, "%H:%M")
-    return int((e - b).total_seconds() // 60)
+    return end - begin
 
 def parse_days(days):
     if days is None:
@@ -52,6 +63,7 @@ def requires_time_slot(primary, sections):
 
 def enrich(raw_courses):
     final = []
+    times = parse_times(raw_courses)
 
     for course in raw_courses:
         entry = {
@@ -68,32 +80,34 @@ def enrich(raw_courses):
         # Process primary
         if course["primary"]:
             p = course["primary"]
-            begin_24 = to_24h(p["begin"])
-            end_24 = to_24h(p["end"])
+            begin_24, begin_min = times[p["begin"]]
+            end_24, end_min = times[p["end"]]
 
             entry["primary"] = {
                 "section_id": f"{course['course']}-Lec",
                 "section": "Lec",
                 "days": parse_days(p["days"]),
                 "begin": begin_24,
+                "begin_min": begin_min,
                 "end": end_24,
-                "duration_minutes": duration_minutes(begin_24, end_24),
+                "duration_minutes": duration_minutes(begin_min, end_min),
                 "meeting_type": "lecture",
                 "requires_time_slot": True
             }
 
         # Process sections
         for s in course["sections"]:
-            begin_24 = to_24h(s["begin"])
-            end_24 = to_24h(s["end"])
+            begin_24, begin_min = times[s["begin"]]
+            end_24, end_min = times[s["end"]]
 
             enriched_section = {
                 "section_id": f"{course['course']}-{s['section']}",
                 "section": s["section"],
                 "days": parse_days(s["days"]),
                 "begin": begin_24,
+                "begin_min": begin_min,
                 "end": end_24,
-                "duration_minutes": duration_minutes(begin_24, end_24),
+                "duration_minutes": duration_minutes(begin_min, end_min),
                 "meeting_type": infer_meeting_type(course["title"], s["section"]),
                 "requires_time_slot": begin_24 is not None
             }
@@ -1,52 +1,132 @@
 # scrapers/time_slots.py
 
-from datetime import datetime, timedelta
-
-def generate_mwf_slots():
-    slots = []
-    start = datetime.strptime("08:00", "%H:%M")
-    for i in range(12):  # up to ~6pm
-        s = start + timedelta(minutes=60 * i)
-        e = s + timedelta(minutes=50)
-        slots.append((s.strftime("%H:%M"), e.strftime("%H:%M")))
-    return slots
-
-def generate_tr_slots():
-    slots = []
-    start = datetime.strptime("08:00", "%H:%M")
-    for i in range(8):  # typical TR range
-        s = start + timedelta(minutes=90 * i)
-        e = s + timedelta(minutes=80)
-        slots.append((s.strftime("%H:%M"), e.strftime("%H:%M")))
-    return slots
-
-MWF_SLOTS = generate_mwf_slots()
-TR_SLOTS = generate_tr_slots()
-
-def map_section_to_slots(section):
-    """ Returns a list of integer slot IDs the section occupies. """
-
-    if section["begin"] is None:
-        return []
-
-    begin = section["begin"]
-    end = section["end"]
-    days = section["days"]
+from functools import lru_cache
+from typing import NamedTuple, Optional
+import numpy as np
+from numba import njit
 
-    # Determine slot set by days
-    if not days:
-        return []
+def _fmt(m):
+    """ Minutes since midnight -> "HH:MM". """
+    h, mm = divmod(m, 60)
+    return f"{h:02d}:{mm:02d}"
+
+def _to_min(hhmm):
+    """ "HH:MM" -> minutes since midnight. """
+    return int(hhmm[:2]) * 60 + int(hhmm[3:])
+
+# Slots sit on a regular grid: slot i starts at FIRST_START + i * step
+FIRST_START = 480 # 08:00
+MWF_STEP, MWF_LEN, MWF_COUNT = 60, 50, 12 # 50-minute slots every hour (up to ~6pm)
+TR_STEP, TR_LEN, TR_COUNT = 90, 80, 8 # 80-minute slots every 90 minutes (typical TR range)
+
+MWF_SLOTS = tuple((_fmt(FIRST_START + MWF_STEP * i), _fmt(FIRST_START + MWF_STEP * i + MWF_LEN))
+                  for i in range(MWF_COUNT))
+TR_SLOTS = tuple((_fmt(FIRST_START + TR_STEP * i), _fmt(FIRST_START + TR_STEP * i + TR_LEN))
+                 for i in range(TR_COUNT))
+
+def _grid_slot(b, step, length, count):
+    # Index of the grid slot containing minute b, or -1: one floor division
+    i = (b - FIRST_START) // step
+    return i if 0 <= i < count and b < FIRST_START + step * i + length else -1
+
+# Compiled copy for _bulk; the cached per-pair path stays plain Python
+_grid_slot_jit = njit(cache=True)(_grid_slot)
+
+_MWF = frozenset(("M", "W", "F"))
+_TR = frozenset(("T", "R"))
 
+# Packed day encoding: one bit per weekday in a uint8, M-T-W-R-F from the LSB
+DAY_BITS = {"M": 1, "T": 2, "W": 4, "R": 8, "F": 16}
+_MWF_BITS = sum(DAY_BITS[d] for d in _MWF)
+_TR_BITS = sum(DAY_BITS[d] for d in _TR)
+
+def _pack(days):
+    """ Day letters -> DAY_BITS mask; letters outside M-F are dropped. """
+    b = 0
+    for c in days:
+        b |= DAY_BITS.get(c, 0)
+    return b
+
+MWF_IDS = tuple(f"MWF_{i}" for i in range(len(MWF_SLOTS)))
+TR_IDS = tuple(f"TR_{i}" for i in range(len(TR_SLOTS)))
+
+_EMPTY = ()
+
+@lru_cache(maxsize=4096)
+def _slots_for(begin_min, days_bits):
+    """ Slot IDs for a (begin_min, days_bits) pair; sections share few distinct pairs. """
     result = []
 
-    for d in days:
-        if d in ["M", "W", "F"]:
-            for idx, (s, e) in enumerate(MWF_SLOTS):
-                if s <= begin < e:
-                    result.append(f"MWF_{idx}")
-        elif d in ["T", "R"]:
-            for idx, (s, e) in enumerate(TR_SLOTS):
-                if s <= begin < e:
-                    result.append(f"TR_{idx}")
-
-    return result
+    # Each slot table has at most one slot containing begin; only resolve
+    # the tables this section's days actually use
+    mwf_idx = _grid_slot(begin_min, MWF_STEP, MWF_LEN, MWF_COUNT) if days_bits & _MWF_BITS else -1
+    tr_idx = _grid_slot(begin_min, TR_STEP, TR_LEN, TR_COUNT) if days_bits & _TR_BITS else -1
+
+    picks = (MWF_IDS[mwf_idx] if mwf_idx >= 0 else None,
+             TR_IDS[tr_idx] if tr_idx >= 0 else None)
+
+    # Walk the set bits lowest first, i.e. the days in M-T-W-R-F order
+    bits = days_bits
+    while bits:
+        lsb = bits & -bits
+        bits ^= lsb
+        slot = picks[1 if lsb & _TR_BITS else 0]
+        if slot is not None:
+            result.append(slot)
+
+    return tuple(result)
+
+class Section(NamedTuple):
+    """ A scraped section as map_section_to_slots arguments: map_section_to_slots(*section). """
+    begin_min: Optional[int]
+    days_bits: int
+
+    @classmethod
+    def from_dict(cls, row):
+        """ Build from a scraped section dict (extra keys are ignored). """
+        begin_min = row.get("begin_min")
+        # Clean JSON written before begin_min was stored only has "HH:MM"
+        if begin_min is None and row["begin"] is not None:
+            begin_min = _to_min(row["begin"])
+        return cls(begin_min, _pack(row["days"] or ()))
+
+def map_section_to_slots(begin_min, days_bits):
+    """ Returns a tuple of slot IDs a section beginning at begin_min
+    (minutes since midnight, None if no time) on days_bits occupies. """
+
+    # Determine slot set by days
+    if begin_min is None or not days_bits:
+        return _EMPTY
+
+    # The cached tuple is returned as-is, shared between equal sections
+    return _slots_for(begin_min, days_bits)
+
+@njit(cache=True)
+def _bulk(begins, days_bits, out):
+    # Compiled core of map_sections_to_slots_bulk; ints only, ids are built after
+    for i in range(begins.shape[0]):
+        b = begins[i]
+        bits = days_bits[i]
+        midx = _grid_slot_jit(b, MWF_STEP, MWF_LEN, MWF_COUNT)
+        tidx = _grid_slot_jit(b, TR_STEP, TR_LEN, TR_COUNT)
+        for j in range(out.shape[1]):
+            if bits & (1 << j):
+                # DAY_BITS order M, T, W, R, F: even columns are MWF days
+                out[i, j] = midx if j % 2 == 0 else tidx
+
+def map_sections_to_slots_bulk(begins_min, days_packed):
+    """ Vectorized map_section_to_slots over a whole catalog.
+
+    begins_min: int[N] begin minutes since midnight (-1 where there is no time)
+    days_packed: uint8[N] OR of DAY_BITS for each section's days
+    Returns one tuple of slot IDs per section, days in M-T-W-R-F order.
+    """
+    begins = np.ascontiguousarray(begins_min, dtype=np.int16)
+    bits = np.ascontiguousarray(days_packed, dtype=np.uint8)
+
+    # codes[i, j] = slot index of section i on weekday j, or -1
+    codes = np.full((len(begins), len(DAY_BITS)), -1, dtype=np.int8)
+    _bulk(begins, bits, codes)
+
+    tables = [MWF_IDS if d in _MWF else TR_IDS for d in DAY_BITS]
+    return [tuple(tables[j][c] for j, c in enumerate(row) if c >= 0) for row in codes.tolist()]
@@ -1,9 +1,18 @@
+import sys
 from pathlib import Path
 
+# Directories already created by this process; repeat calls skip the syscalls
+_created = set()
+
 def mkdir(path):
-    Path(path).mkdir(parents=True, exist_ok=True)
+    p = str(path)
+    if p in _created:
+        return
+    Path(p).mkdir(parents=True, exist_ok=True)
+    _created.add(p)
+
+_BAR = "=" * 30
 
 def banner(term):
-    print("\n" + "=" * 30)
-    print(f"  SCRAPING TERM: {term}")
-    print("=" * 30)
+    # One write of the whole banner instead of three print calls
+    sys.stdout.write(f"\n{_BAR}\n  SCRAPING TERM: {term}\n{_BAR}\n")
@@ -0,0 +1,790 @@
+# src/hybrid_runner.py
+
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from numba import njit, prange
+from scipy import sparse
+from braket.circuits import Circuit, Gate, Instruction
+from braket.aws import AwsDevice
+from braket.device_schema import DeviceActionType
+from braket.jobs import save_job_result
+
+
+# ============================================================
+# 1. LOAD QUBO (JSON FORMAT)
+# ============================================================
+
+# Keys parsed per block, so the temporary joined string stays bounded
+PARSE_CHUNK = 1 << 16
+
+
+def _qubo_columns(pairs):
+    """Turn ("(i, j)", value) pairs into int32 i/j and float32 value columns."""
+    m = len(pairs)
+    # n <= 50 and integer penalties, so int32 / float32 lose nothing
+    ij = np.empty(2 * m, dtype=np.int32)
+    v = np.empty(m, dtype=np.float32)
+
+    for start in range(0, m, PARSE_CHUNK):
+        block = pairs[start:start + PARSE_CHUNK]
+        keys = ",".join(k for k, _ in block).replace("(", "").replace(")", "")
+        ij[2 * start:2 * (start + len(block))] = np.fromstring(keys, dtype=np.int32, sep=",")
+        v[start:start + len(block)] = [val for _, val in block]
+
+    return ij[0::2].copy(), ij[1::2].copy(), v
+
+
+def load_qubo_json(input_path):
+    """Load QUBO from qubo.json and var_map.json inside mounted directory.
+
+    The QUBO comes back as parallel (i, j, value) arrays rather than a dict.
+    """
+    qubo_file = os.path.join(input_path, "qubo.json")
+    varmap_file = os.path.join(input_path, "var_map.json")
+
+    print("Looking for QUBO at:", qubo_file)
+    print("Looking for var_map at:", varmap_file)
+
+    if not os.path.exists(qubo_file):
+        raise FileNotFoundError(f"QUBO file missing: {qubo_file}")
+
+    if not os.path.exists(varmap_file):
+        raise FileNotFoundError(f"var_map.json missing: {varmap_file}")
+
+    with open(qubo_file, "r") as f:
+        # Hand the parsed pairs straight to the column builder, no dict in between
+        i, j, v = json.load(f, object_pairs_hook=_qubo_columns)
+
+    with open(varmap_file, "r") as f:
+        var_map = json.load(f)
+
+    return (i, j, v), var_map
+
+
+# ============================================================
+# 2. CONVERT QUBO TO ISING
+# ============================================================
+
+@njit(cache=True)
+def _assemble(i, j, v, h, rows, cols, data):
+    """Single pass over QUBO terms: fill h and the symmetric COO buffers.
+
+    Returns the number of COO entries written.
+    """
+    k = 0
+    for t in range(v.shape[0]):
+        a = i[t]
+        b = j[t]
+        if a == b:
+            h[a] += v[t]
+        else:
+            half = np.float32(0.5) * v[t]
+            rows[k] = a
+            cols[k] = b
+            data[k] = half
+            rows[k + 1] = b
+            cols[k + 1] = a
+            data[k + 1] = half
+            k += 2
+    return k
+
+
+def qubo_to_ising(i, j, v):
+    """Convert QUBO (i, j, value) arrays into Ising h and a sparse (CSR) symmetric J."""
+    # One fused element-wise max and one reduction instead of two scans
+    n = int(np.maximum(i, j).max()) + 1
+    h = np.zeros(n, dtype=np.float32)
+
+    # Worst case every term is off-diagonal and stored twice. Only the first
+    # nnz slots are ever read, so skip zero-filling the buffers
+    rows = np.empty(2 * len(v), dtype=np.int32)
+    cols = np.empty(2 * len(v), dtype=np.int32)
+    data = np.empty(2 * len(v), dtype=np.float32)
+    nnz = _assemble(i, j, v, h, rows, cols, data)
+
+    # Duplicate (i, j) entries are summed on conversion to CSR
+    J = sparse.coo_matrix(
+        (data[:nnz], (rows[:nnz], cols[:nnz])), shape=(n, n)
+    ).tocsr()
+
+    return h, J
+
+
+def qubo_matrix(i, j, v, n):
+    """Dense upper-triangular QUBO matrix, so the objective is x^T Q x."""
+    Q = np.zeros((n, n))
+    np.add.at(Q, (np.minimum(i, j), np.maximum(i, j)), v)
+    return Q
+
+
+# Bump when the cached array layout changes so stale files are ignored
+ISING_CACHE_VERSION = 3
+
+
+def load_ising_cached(input_path, cache_dir):
+    """Load (h, J, Q, qubo_terms), reusing an on-disk copy keyed by the QUBO hash."""
+    qubo_file = os.path.join(input_path, "qubo.json")
+    if not os.path.exists(qubo_file):
+        raise FileNotFoundError(f"QUBO file missing: {qubo_file}")
+
+    with open(qubo_file, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    cache_file = os.path.join(cache_dir, f"ising_{digest}.npz")
+
+    if os.path.exists(cache_file):
+        with np.load(cache_file) as cached:
+            if int(cached["version"]) == ISING_CACHE_VERSION:
+                print("Loaded cached Ising model:", cache_file)
+                h = cached["h"]
+                n = len(h)
+                J = sparse.csr_matrix(
+                    (cached["data"], cached["indices"], cached["indptr"]), shape=(n, n)
+                )
+                return h, J, cached["Q"], int(cached["qubo_terms"])
+
+    (i, j, v), _ = load_qubo_json(input_path)
+    h, J = qubo_to_ising(i, j, v)
+    Q = qubo_matrix(i, j, v, len(h))
+
+    # The cache is only an optimization: an unwritable directory must not fail the job
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(
+            cache_file,
+            version=ISING_CACHE_VERSION,
+            h=h,
+            data=J.data,
+            indices=J.indices,
+            indptr=J.indptr,
+            Q=Q,
+            qubo_terms=len(v),
+        )
+        print("Cached Ising model:", cache_file)
+    except OSError as e:
+        print("Skipping Ising cache write:", e)
+
+    return h, J, Q, len(v)
+
+
+# Coefficients at or below this magnitude are dropped before circuit building
+PRUNE_TOL = 1e-12
+
+
+def prune_ising(h, J, prune_tol=PRUNE_TOL):
+    """Zero out |h_i| and |J_ij| <= prune_tol; the qubit count is unchanged."""
+    h = np.where(np.abs(h) > prune_tol, h, 0).astype(h.dtype)
+
+    J = J.copy()
+    J.data[np.abs(J.data) <= prune_tol] = 0
+    J.eliminate_zeros()
+
+    return h, J
+
+
+# ============================================================
+# 3. ONE QAOA LAYER
+# ============================================================
+
+def nonzero_terms(h, J):
+    """Extract the non-zero linear and upper-triangle coupling terms once."""
+    # Index masks instead of per-entry Python comparisons
+    h_idx = np.flatnonzero(h)
+
+    upper = sparse.triu(J, k=1).tocoo()
+    live = np.flatnonzero(upper.data)
+
+    # Braket takes plain Python numbers, so cast back from float32 here
+    h_terms = list(zip(h_idx.tolist(), h[h_idx].tolist()))
+    J_terms = list(zip(
+        upper.row[live].tolist(),
+        upper.col[live].tolist(),
+        upper.data[live].tolist(),
+    ))
+
+    return h_terms, J_terms
+
+
+def schedule_couplings(J_terms):
+    """Order ZZ terms so couplings on disjoint qubits end up in the same moment.
+
+    Greedy edge colouring of the interaction graph: every colour class is a
+    matching, so emitting class by class lets the circuit pack each class
+    into one layer. The ZZ rotations commute, so the order is free.
+    """
+    used = {}
+    colours = []
+    for i, j, _ in J_terms:
+        taken = used.setdefault(i, set()) | used.setdefault(j, set())
+        c = 0
+        while c in taken:
+            c += 1
+        used[i].add(c)
+        used[j].add(c)
+        colours.append(c)
+
+    order = sorted(range(len(J_terms)), key=colours.__getitem__)
+    return [J_terms[k] for k in order]
+
+
+def layer_records(n, h_terms, J_terms, native_zz=False):
+    """The gates of one QAOA layer as (gate, target, coeff, uses_gamma) records.
+
+    Each rotation angle is coeff * gamma (cost) or coeff * beta (mixer);
+    gate None marks an angle-free CNOT.
+    """
+    records = []
+
+    # Cost Hamiltonian
+    for i, hi in h_terms:
+        records.append((Gate.Rz, i, 2.0 * hi, True))
+
+    for i, j, Jij in J_terms:
+        # exp(-i theta/2 Z_i Z_j), as one ZZ gate when the device has it
+        if native_zz:
+            records.append((Gate.ZZ, [i, j], 2.0 * Jij, True))
+        else:
+            records.append((None, [i, j], 0.0, True))
+            records.append((Gate.Rz, j, 2.0 * Jij, True))
+            records.append((None, [i, j], 0.0, True))
+
+    # Mixer
+    for i in range(n):
+        records.append((Gate.Rx, i, 2.0, False))
+
+    return records
+
+
+# ============================================================
+# 4. FULL QAOA CIRCUIT
+# ============================================================
+
+def compile_qaoa_template(p, h, J, native_zz=False):
+    """Freeze the gate sequence for (h, J); returns apply(gammas, betas) -> Circuit.
+
+    The qubits and gate types are identical for every layer and every angle
+    setting, so term extraction and scheduling happen once here and each
+    call only computes the angles.
+    """
+    n = len(h)
+
+    # The cost terms are the same for every layer, only the angles change
+    h_terms, J_terms = nonzero_terms(h, J)
+    J_terms = schedule_couplings(J_terms)
+
+    gates, targets, coeffs, uses_gamma = zip(*layer_records(n, h_terms, J_terms, native_zz))
+    coeffs = np.array(coeffs)
+    uses_gamma = np.array(uses_gamma)
+
+    # Angle-free instructions are built once and shared by every circuit
+    head = [Instruction(Gate.H(), q) for q in range(n)]  # uniform superposition
+    fixed = [
+        Instruction(Gate.CNot(), target) if gate is None else None
+        for gate, target in zip(gates, targets)
+    ]
+
+    def apply(gammas, betas):
+        # (p, gates per layer) angle table in one broadcast multiply
+        scale = np.where(
+            uses_gamma,
+            np.asarray(gammas, dtype=float)[:p, None],
+            np.asarray(betas, dtype=float)[:p, None],
+        )
+        thetas = (scale * coeffs).tolist()
+
+        # Collect every gate first and hand the list to Circuit in one go
+        instrs = list(head)
+        for row in thetas:
+            instrs += [
+                instr if gate is None else Instruction(gate(theta), target)
+                for gate, target, instr, theta in zip(gates, targets, fixed, row)
+            ]
+
+        circ = Circuit(instrs)
+
+        # Register all measurements in one call rather than one per qubit
+        circ.measure(range(n))
+
+        return circ
+
+    return apply
+
+
+def build_qaoa_circuit(p, h, J, gammas, betas, native_zz=False):
+    return compile_qaoa_template(p, h, J, native_zz)(gammas, betas)
+
+
+# ============================================================
+# 5. LOCAL STATE-VECTOR SIMULATOR
+# ============================================================
+
+# Up to this many qubits the state vector (8 B * 2^n) is cheap to hold,
+# and evolving it in-process beats the round-trip to a managed simulator.
+# Only the default when the job has no device to run on; with a device ARN
+# set, local simulation must be asked for via the local_max hyperparameter
+LOCAL_MAX = 24
+
+
+@njit(parallel=True, cache=True)
+def _cost_diagonal(n, h, rows, cols, vals):
+    """E(x) = sum_i h_i z_i + sum_(i<j) J_ij z_i z_j for every basis state x.
+
+    Qubit 0 is the most significant bit, matching Braket's ordering, and
+    z = +1 for bit 0. The cost unitary is diagonal, so one pass suffices.
+    """
+    dim = 1 << n
+    energy = np.empty(dim)
+    for x in prange(dim):
+        e = 0.0
+        for q in range(n):
+            if (x >> (n - 1 - q)) & 1:
+                e -= h[q]
+            else:
+                e += h[q]
+        for k in range(vals.shape[0]):
+            # z_i z_j is -1 exactly when the two bits differ
+            if ((x >> (n - 1 - rows[k])) ^ (x >> (n - 1 - cols[k]))) & 1:
+                e -= vals[k]
+            else:
+                e += vals[k]
+        energy[x] = e
+    return energy
+
+
+@njit(parallel=True, cache=True)
+def _apply_cost(psi, energy, gamma):
+    """psi <- exp(-i gamma E) psi, a per-amplitude phase."""
+    # gamma * E can reach thousands of radians with the hard penalties, so
+    # the phase itself is taken in float64 before rounding to complex64
+    for x in prange(psi.shape[0]):
+        psi[x] *= np.complex64(np.exp(-1j * gamma * energy[x]))
+
+
+@njit(parallel=True, cache=True)
+def _apply_mixer(psi, n, beta):
+    """psi <- prod_q RX_q(2 beta) psi via strided amplitude pairs."""
+    c = np.float32(np.cos(beta))
+    s = np.complex64(-1j * np.sin(beta))
+    half = psi.shape[0] >> 1
+    for q in range(n):
+        stride = 1 << (n - 1 - q)
+        for k in prange(half):
+            # Insert a 0 at the qubit's bit position to get the pair's lower index
+            low = k & (stride - 1)
+            a = ((k - low) << 1) | low
+            b = a | stride
+            pa = psi[a]
+            pb = psi[b]
+            psi[a] = c * pa + s * pb
+            psi[b] = s * pa + c * pb
+
+
+def simulate_qaoa_local(p, h, J, gammas, betas, shots, rng):
+    """Run the QAOA circuit on a local state vector; returns (shots, n) 0/1 samples."""
+    n = len(h)
+    upper = sparse.triu(J, k=1).tocoo()
+    energy = _cost_diagonal(
+        n,
+        h.astype(np.float64),
+        upper.row.astype(np.int64),
+        upper.col.astype(np.int64),
+        upper.data.astype(np.float64),
+    )
+
+    # Uniform superposition, then p cost/mixer layers. complex64 halves the
+    # memory traffic of every pass; amplitudes need nowhere near double precision
+    psi = np.full(1 << n, 1.0 / np.sqrt(1 << n), dtype=np.complex64)
+    for layer in range(p):
+        _apply_cost(psi, energy, gammas[layer])
+        _apply_mixer(psi, n, betas[layer])
+
+    # Normalize in float64 so rng.choice's sum-to-one check holds at 2^24 entries
+    probs = np.abs(psi).astype(np.float64) ** 2
+    idx = rng.choice(1 << n, size=shots, p=probs / probs.sum())
+
+    shifts = np.arange(n - 1, -1, -1)
+    return ((idx[:, None] >> shifts) & 1).astype(np.uint8)
+
+
+# ============================================================
+# 6. CLASSICAL POST-PROCESSING
+# ============================================================
+
+def evaluate_qubo(bits, Q):
+    """QUBO objective x^T Q x of one 0/1 assignment."""
+    x = np.asarray(bits, dtype=np.float64)
+    return float(x @ Q @ x)
+
+
+def best_sampled_solution(samples, Q):
+    """Lowest-energy shot of a (shots, n) 0/1 array, with its QUBO energy."""
+    # All shots at once: one (shots, n) @ (n, n) matmul, then a row-wise dot
+    samples = np.asarray(samples, dtype=np.uint8)
+    S = samples.astype(np.float64)
+    energies = ((S @ Q) * S).sum(axis=1)
+    idx = int(energies.argmin())
+
+    bitstring = (samples[idx] + ord("0")).tobytes().decode()
+    return bitstring, float(energies[idx])
+
+
+@njit(cache=True)
+def greedy_flip(bits, Q):
+    """Single-bit-flip descent from bits until no flip lowers x^T Q x.
+
+    field[i] = Q[i,i] + sum over j != i with x_j = 1 of (Q[i,j] + Q[j,i]) is
+    the energy change of setting x_i to 1, so flipping i changes the energy
+    by (1 - 2 x_i) * field[i] and each accepted flip updates field in O(n).
+    """
+    n = bits.shape[0]
+    x = bits.astype(np.int8)
+
+    field = np.empty(n)
+    for i in range(n):
+        f = Q[i, i]
+        for j in range(n):
+            # Add on set bits rather than multiply by the bit, as in qbsolv
+            if x[j] and j != i:
+                f += Q[i, j] + Q[j, i]
+        field[i] = f
+
+    while True:
+        best_i = -1
+        best_delta = 0.0
+        for i in range(n):
+            delta = -field[i] if x[i] else field[i]
+            if delta < best_delta:
+                best_i = i
+                best_delta = delta
+        if best_i < 0:
+            break
+
+        x[best_i] ^= 1
+        sign = 1.0 if x[best_i] else -1.0
+        for j in range(n):
+            if j != best_i:
+                field[j] += sign * (Q[j, best_i] + Q[best_i, j])
+
+    return x
+
+
+# Exact search is only attempted up to this many variables (2^n states)
+BRUTE_FORCE_MAX = 20
+
+
+@njit(parallel=True, cache=True)
+def brute_force_qubo(Q, prefix_bits=6):
+    """Exact minimum of x^T Q x over all 2^n assignments; returns (bits, energy).
+
+    The top prefix_bits variables are fixed per parallel task and the rest
+    are walked in Gray-code order, so every step flips a single bit and the
+    energy moves by that bit's local field (see greedy_flip).
+    """
+    n = Q.shape[0]
+    m = min(prefix_bits, n)
+    low = n - m
+    n_tasks = 1 << m
+
+    task_energy = np.empty(n_tasks)
+    task_state = np.empty(n_tasks, dtype=np.int64)
+
+    for t in prange(n_tasks):
+        # Variable i is bit i of state; the prefix occupies the top m bits
+        state = np.int64(t) << low
+        x = np.zeros(n, dtype=np.int8)
+        for i in range(n):
+            x[i] = (state >> i) & 1
+
+        field = np.empty(n)
+        e = 0.0
+        for i in range(n):
+            f = Q[i, i]
+            for j in range(n):
+                if x[j] and j != i:
+                    f += Q[i, j] + Q[j, i]
+            field[i] = f
+            if x[i]:
+                # Each set pair is counted from both ends, so halve it
+                e += 0.5 * (f + Q[i, i])
+
+        best_e = e
+        best_state = state
+        for step in range(1, 1 << low):
+            # Gray code: flip the bit at the step's lowest set position
+            i = 0
+            while not (step >> i) & 1:
+                i += 1
+
+            if x[i]:
+                e -= field[i]
+                sign = -1.0
+            else:
+                e += field[i]
+                sign = 1.0
+            x[i] ^= 1
+            state ^= 1 << i
+
+            for j in range(n):
+                if j != i:
+                    field[j] += sign * (Q[j, i] + Q[i, j])
+
+            if e < best_e:
+                best_e = e
+                best_state = state
+
+        task_energy[t] = best_e
+        task_state[t] = best_state
+
+    k = np.argmin(task_energy)
+    bits = np.empty(n, dtype=np.int8)
+    for i in range(n):
+        bits[i] = (task_state[k] >> i) & 1
+    return bits, task_energy[k]
+
+
+# ============================================================
+# 7. HYBRID JOB ENTRYPOINT
+# ============================================================
+
+def counts_from_measurements(samples):
+    """Bitstring -> count from a (shots, n) 0/1 array, formatting unique rows only."""
+    samples = np.asarray(samples, dtype=np.uint8)
+    n = samples.shape[1]
+
+    # View each packed row as one opaque key so np.unique dedups whole shots
+    packed = np.packbits(samples, axis=1)
+    keys = packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+    _, first, cnt = np.unique(keys, return_index=True, return_counts=True)
+
+    # '0'/'1' bytes for the unique rows, read back as n-char strings
+    chars = np.ascontiguousarray(samples[first] + ord("0"))
+    bitstrings = chars.view(f"S{n}").ravel()
+
+    return {bits.decode(): int(c) for bits, c in zip(bitstrings, cnt)}
+
+
+def _supports_zz(device):
+    """True if the device accepts the two-qubit ZZ rotation natively."""
+    action = device.properties.action.get(DeviceActionType.OPENQASM)
+    ops = getattr(action, "supportedOperations", None) or []
+    return "zz" in {op.lower() for op in ops}
+
+
+def _per_layer(angle, p):
+    """Broadcast a scalar angle to all p layers; lists pass through."""
+    if isinstance(angle, (int, float)):
+        return [float(angle)] * p
+    return list(angle)
+
+
+def _check_layers(gammas, betas, p):
+    """Both backends index one angle per layer, so each list must cover all p layers."""
+    if len(gammas) < p or len(betas) < p:
+        raise ValueError(
+            f"Need p={p} angles per list, got {len(gammas)} gammas and {len(betas)} betas"
+        )
+
+
+def run(**kwargs):
+    print("=== Amazon Braket Hybrid Job Started ===")
+
+    # Hyperparameters
+    p = int(kwargs.get("p", 1))
+    shots = int(kwargs.get("shots", 500))
+
+    gammas = kwargs.get("gammas") or [0.1] * p
+    betas  = kwargs.get("betas") or [0.2] * p
+
+    # Optional sweep: list of (gammas, betas) pairs submitted as one batch
+    angles = kwargs.get("angles")
+    if isinstance(angles, str):
+        angles = json.loads(angles)
+    if angles:
+        angles = [(_per_layer(g, p), _per_layer(b, p)) for g, b in angles]
+    else:
+        angles = [(gammas, betas)]
+    for g, b in angles:
+        _check_layers(g, b, p)
+    gammas, betas = angles[0]
+
+    print(f"Hyperparameters: p={p}, shots={shots}")
+    print("gammas:", gammas)
+    print("betas:", betas)
+    if len(angles) > 1:
+        print("Angle configurations in batch:", len(angles))
+
+    # ============================================================
+    # FIXED: Correct input directory for hybrid jobs
+    # ============================================================
+    # Amazon Braket ALWAYS mounts input data here:
+    #     /opt/braket/input/data/<channel>/
+    base_dir = "/opt/braket/input/data/input"
+    print("Resolved input path:", base_dir)
+
+    # ============================================================
+    # Load QUBO
+    # ============================================================
+    # The checkpoint dir is synced to S3, so later jobs can reuse the cache;
+    # without one, stay off the (possibly read-only) input mount
+    cache_dir = os.environ.get("AMZN_BRAKET_CHECKPOINT_DIR") or tempfile.gettempdir()
+
+    # Load QUBO and convert QUBO → Ising (cached by file hash)
+    h, J, Q, qubo_terms = load_ising_cached(base_dir, cache_dir)
+    print("Loaded QUBO terms:", qubo_terms)
+
+    # Terms that cancelled to (near) zero would only emit identity-like gates
+    prune_tol = float(kwargs.get("prune_tol", PRUNE_TOL))
+    h, J = prune_ising(h, J, prune_tol)
+
+    n = len(h)
+    print("Number of qubits:", n)
+
+    if n > 50:
+        raise ValueError("TN1 cannot run >50 qubits. Reduce problem size.")
+
+    device_arn = os.environ.get("AMZN_BRAKET_DEVICE_ARN")
+    local_max = int(kwargs.get("local_max", 0 if device_arn else LOCAL_MAX))
+
+    if n <= local_max:
+        # ========================================================
+        # Small problem: evolve the state vector in-process
+        # ========================================================
+        print(f"Simulating locally (n <= {local_max})...")
+        seed = kwargs.get("seed")
+        rng = np.random.default_rng(None if seed is None else int(seed))
+        samples = [simulate_qaoa_local(p, h, J, g, b, shots, rng) for g, b in angles]
+        backend = "local"
+
+    else:
+        if device_arn is None:
+            raise ValueError(
+                f"AMZN_BRAKET_DEVICE_ARN is not set and n={n} exceeds local_max={local_max}"
+            )
+        device = AwsDevice(device_arn)
+        backend = device_arn
+        native_zz = _supports_zz(device)
+
+        # ========================================================
+        # Build p-layer QAOA circuit
+        # ========================================================
+        print("Building QAOA circuit...")
+        print("Native ZZ gate:", native_zz)
+        qaoa_circuit = compile_qaoa_template(p, h, J, native_zz)
+        circuits = [qaoa_circuit(g, b) for g, b in angles]
+
+        # ========================================================
+        # Run circuit on TN1 or local simulator
+        # ========================================================
+        print("Running on device:", device_arn)
+
+        if len(circuits) == 1:
+            results = [device.run(circuits[0], shots=shots).result()]
+        else:
+            # One API round-trip for the whole sweep instead of one per circuit.
+            # results() already waits on the tasks from a thread pool; the cap
+            # that serializes a wide sweep is how many tasks are in flight
+            max_parallel = kwargs.get("max_parallel")
+            batch = device.run_batch(
+                circuits,
+                shots=shots,
+                max_parallel=None if max_parallel is None else int(max_parallel),
+            )
+            # Tasks that still failed after retries come back as None
+            results = batch.results()
+
+        # Braket returns int64 measurements; shrink to one byte per bit up front
+        # so counting and scoring don't each convert the full shot array again
+        samples = [
+            None if result is None else np.asarray(result.measurements, dtype=np.uint8)
+            for result in results
+        ]
+
+    # Convert bitstrings to JSON-serializable form
+    sweep = []
+    failed = []  # sweep points whose task failed; the rest are still reported
+    for (g, b), shot_bits in zip(angles, samples):
+        if shot_bits is None:
+            failed.append({"gammas": g, "betas": b})
+            continue
+        counts = counts_from_measurements(shot_bits)
+        best, best_energy = best_sampled_solution(shot_bits, Q)
+
+        # Polish the best shot with a classical local search
+        refined = greedy_flip(np.frombuffer(best.encode(), dtype=np.uint8) - ord("0"), Q)
+        sweep.append({
+            "gammas": g,
+            "betas": b,
+            "counts": counts,
+            "best_bitstring": best,
+            "best_energy": best_energy,
+            "refined_bitstring": "".join(map(str, refined.tolist())),
+            "refined_energy": evaluate_qubo(refined, Q),
+        })
+    if failed:
+        print(f"Failed sweep points: {len(failed)} of {len(angles)}")
+    if not sweep:
+        raise RuntimeError("Every quantum task in the sweep failed")
+    counts = sweep[0]["counts"]
+
+    # Best assignments seen anywhere in the sweep, scored on the QUBO itself
+    best_run = min(sweep, key=lambda entry: entry["best_energy"])
+    refined_run = min(sweep, key=lambda entry: entry["refined_energy"])
+
+    print("Counts:", counts)
+    print("Best sampled bitstring:", best_run["best_bitstring"])
+    print("Best QUBO energy:", best_run["best_energy"])
+    print("Refined bitstring:", refined_run["refined_bitstring"])
+    print("Refined QUBO energy:", refined_run["refined_energy"])
+
+    # Small instances: the exact optimum, to judge how close QAOA got
+    exact = {}
+    if n <= int(kwargs.get("brute_force_max", BRUTE_FORCE_MAX)):
+        exact_bits, exact_energy = brute_force_qubo(Q)
+        exact = {
+            "exact_bitstring": "".join(map(str, exact_bits.tolist())),
+            "exact_energy": float(exact_energy),
+        }
+        print("Exact QUBO energy:", exact["exact_energy"])
+
+    # ============================================================
+    # Output final results
+    # ============================================================
+    save_job_result({
+        "backend": backend,
+        "counts": counts,
+        "qubo_terms": qubo_terms,
+        "n_qubits": n,
+        "p": p,
+        "gammas": gammas,
+        "betas": betas,
+        "shots": shots,
+        "best_bitstring": best_run["best_bitstring"],
+        "best_energy": best_run["best_energy"],
+        "refined_bitstring": refined_run["refined_bitstring"],
+        "refined_energy": refined_run["refined_energy"],
+        **exact,
+        "sweep": sweep,
+        "failed": failed,
+    })
+
+    print("=== Hybrid Job DONE ===")
+
+    return {
+        "backend": backend,
+        "counts": counts,
+        "qubo_terms": qubo_terms,
+        "n_qubits": n,
+        "p": p,
+        "gammas": gammas,
+        "betas": betas,
+        "shots": shots,
+        "best_bitstring": best_run["best_bitstring"],
+        "best_energy": best_run["best_energy"],
+        "refined_bitstring": refined_run["refined_bitstring"],
+        "refined_energy": refined_run["refined_energy"],
+        **exact,
+        "sweep": sweep,
+        "failed": failed,
+    }